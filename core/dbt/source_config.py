@@ -1,16 +1,22 @@
-from typing import Dict, Any
+import weakref
+from collections.abc import Mapping
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
 
 import dbt.exceptions
 
-from dbt.utils import deep_merge
+from dbt.utils import deep_merge_item
 from dbt.node_types import NodeType
 from dbt.adapters.factory import get_adapter_class_by_name
 
 
 class SourceConfig:
-    AppendListFields = {'pre-hook', 'post-hook', 'tags'}
-    ExtendDictFields = {'vars', 'column_types', 'quoting', 'persist_docs'}
-    ClobberFields = {
+    AppendListFields = frozenset({'pre-hook', 'post-hook', 'tags'})
+    ExtendDictFields = frozenset(
+        {'vars', 'column_types', 'quoting', 'persist_docs'}
+    )
+    ClobberFields = frozenset({
         'alias',
         'schema',
         'enabled',
@@ -31,9 +37,18 @@ class SourceConfig:
         'check_cols',
         # seeds
         'quote_columns',
-    }
+    })
     ConfigKeys = AppendListFields | ExtendDictFields | ClobberFields
 
+    # a SourceConfig is created per node; slots keep the per-instance
+    # footprint down. The adapter-aware field sets can't share names with
+    # the class-level sets above, hence the underscored attributes.
+    __slots__ = (
+        '_config', 'active_project', 'own_project', 'fqn', 'node_type',
+        'AdapterSpecificConfigs', '_clobber_fields', '_config_keys',
+        '_in_model_handlers', 'in_model_config',
+    )
+
     def __init__(self, active_project, own_project, fqn, node_type):
         self._config = None
         # active_project is a RuntimeConfig, not a Project
@@ -43,32 +58,57 @@ class SourceConfig:
         self.node_type = node_type
 
         adapter_type = active_project.credentials.type
-        adapter_class = get_adapter_class_by_name(adapter_type)
-        self.AdapterSpecificConfigs = adapter_class.AdapterSpecificConfigs
+        (self.AdapterSpecificConfigs,
+         self._clobber_fields,
+         self._config_keys,
+         self._in_model_handlers) = _get_field_sets(adapter_type)
 
-        # the config options defined within the model
-        self.in_model_config: Dict[str, Any] = {}
+        # the config options defined within the model; most models never set
+        # any, so allocate the dict on first update
+        self.in_model_config: Optional[Dict[str, Any]] = None
 
     def _merge(self, *configs):
+        """Accumulate configs into a single dict, without mutating any input.
+
+        The generic dbt.utils.deep_merge recursion is unnecessary here: the
+        structure is known. Clobber fields overwrite, append fields are flat
+        lists (later configs go in front, matching deep_merge's list
+        handling), and extend fields are only ever one level deep.
+        """
         merged_config: Dict[str, Any] = {}
-        for config in configs:
-            # Do not attempt to deep merge clobber fields
-            config = config.copy()
-            clobber = {
-                key: config.pop(key) for key in list(config.keys())
-                if key in (self.ClobberFields | self.AdapterSpecificConfigs)
-            }
-            intermediary_merged = deep_merge(
-                merged_config, config
-            )
-            intermediary_merged.update(clobber)
+        append_fields = self.AppendListFields
+        extend_fields = self.ExtendDictFields
+        clobber_fields = self._clobber_fields
 
-            merged_config.update(intermediary_merged)
+        for config in configs:
+            if not config:
+                continue
+            for key, value in config.items():
+                if key in clobber_fields:
+                    merged_config[key] = value
+                elif key in append_fields:
+                    if not isinstance(value, (list, tuple)):
+                        value = [value]
+                    current = merged_config.get(key)
+                    if current:
+                        merged_config[key] = list(value) + current
+                    else:
+                        merged_config[key] = list(value)
+                elif key in extend_fields:
+                    current = merged_config.get(key)
+                    if current is None:
+                        merged_config[key] = dict(value)
+                    else:
+                        current.update(value)
+                elif key in merged_config and isinstance(value, (dict, list,
+                                                                 tuple)):
+                    # unrecognized structured keys are rare; keep
+                    # deep_merge's semantics for them
+                    deep_merge_item(merged_config, key, deepcopy(value))
+                else:
+                    merged_config[key] = value
         return merged_config
 
-    # this is re-evaluated every time `config` is called.
-    # we can cache it, but that complicates things.
-    # TODO : see how this fares performance-wise
     @property
     def config(self):
         """
@@ -81,17 +121,15 @@ class SourceConfig:
          if this is a top-level model:
            - active project config
            - in-model config
-        """
-
-        defaults = {"enabled": True, "materialized": "view"}
 
-        if self.node_type == NodeType.Seed:
-            defaults['materialized'] = 'seed'
-        elif self.node_type == NodeType.Snapshot:
-            defaults['materialized'] = 'snapshot'
+        The resolved config is cached; `update_in_model_config` is the only
+        mutable input, so it invalidates the cache. Callers may mutate the
+        top level of the returned dict, so hand out a fresh shallow copy.
+        """
+        if self._config is not None:
+            return dict(self._config)
 
-        if self.node_type == NodeType.Test:
-            defaults['severity'] = 'ERROR'
+        defaults = _default_config(self.node_type)
 
         active_config = self.load_config_from_active_project()
 
@@ -105,112 +143,151 @@ class SourceConfig:
                 defaults, own_config, self.in_model_config, active_config
             )
 
-        return cfg
+        # project configs no longer carry empty append/extend skeletons, so
+        # guarantee the keys here, once per node
+        for key in self.AppendListFields:
+            cfg.setdefault(key, [])
+        for key in self.ExtendDictFields:
+            cfg.setdefault(key, {})
+
+        self._config = cfg
+        return dict(cfg)
 
     def _translate_adapter_aliases(self, config):
-        return self.active_project.credentials.translate_aliases(config)
+        # in-model configs repeat heavily across nodes (think
+        # {'materialized': 'table'}), and alias translation only depends on
+        # the adapter type, so memoize it when the config is hashable. The
+        # result is treated as read-only by update_in_model_config.
+        credentials = self.active_project.credentials
+        try:
+            cache_key = (credentials.type, frozenset(config.items()))
+        except TypeError:
+            # values like hook lists and var dicts aren't hashable
+            return credentials.translate_aliases(config)
+
+        translated = _TRANSLATION_CACHE.get(cache_key)
+        if translated is None:
+            translated = credentials.translate_aliases(config)
+            _TRANSLATION_CACHE[cache_key] = translated
+        return translated
 
     def update_in_model_config(self, config):
+        self._config = None
         config = self._translate_adapter_aliases(config)
+        handlers = self._in_model_handlers
+        in_model_config = self.in_model_config
+        if in_model_config is None:
+            in_model_config = self.in_model_config = {}
         for key, value in config.items():
-            if key in self.AppendListFields:
-                current = self.in_model_config.get(key, [])
-                if not isinstance(value, (list, tuple)):
+            handler = handlers.get(key)
+            if handler is None:
+                # clobber fields, adapter-specific configs, and anything else
+                # simply overwrite
+                in_model_config[key] = value
+            else:
+                handler(in_model_config, key, value)
+
+    def smart_update(self, mutable_config, new_configs):
+        relevant_configs: Dict[str, Any] = {}
+        # this runs once per config level per node; keep the field sets in
+        # locals so the loop doesn't re-fetch them from self
+        append_fields = self.AppendListFields
+        extend_fields = self.ExtendDictFields
+        clobber_fields = self._clobber_fields
+
+        for key, value in new_configs.items():
+            if key in append_fields:
+                relevant_configs[key] = value
+                current = mutable_config.get(key)
+                if current is None:
+                    current = mutable_config[key] = []
+                # exact-class checks cover everything yaml/jinja hand us and
+                # are much cheaper than isinstance; odd subclasses still get
+                # the full check
+                cls = value.__class__
+                if cls is not list and cls is not tuple and \
+                        not isinstance(value, (list, tuple)):
                     value = [value]
-                current.extend(value)
-                self.in_model_config[key] = current
-            elif key in self.ExtendDictFields:
-                current = self.in_model_config.get(key, {})
                 try:
-                    current.update(value)
-                except (ValueError, TypeError, AttributeError):
+                    seen = set(current)
+                    fresh = [f for f in value if f not in seen]
+                except TypeError:
+                    # pre/post-hooks may be dicts, which are unhashable
+                    fresh = [f for f in value if f not in current]
+                current.extend(fresh)
+            elif key in extend_fields:
+                relevant_configs[key] = value
+                # check the shape up front instead of paying for a
+                # try/except frame on the hot path
+                if value.__class__ is not dict and \
+                        not isinstance(value, Mapping):
                     dbt.exceptions.raise_compiler_error(
                         'Invalid config field: "{}" must be a dict'.format(key)
                     )
-                self.in_model_config[key] = current
-            else:  # key in self.ClobberFields or self.AdapterSpecificConfigs
-                self.in_model_config[key] = value
-
-    @staticmethod
-    def __get_as_list(relevant_configs, key):
-        if key not in relevant_configs:
-            return []
-
-        items = relevant_configs[key]
-        if not isinstance(items, (list, tuple)):
-            items = [items]
-
-        return items
-
-    def smart_update(self, mutable_config, new_configs):
-        config_keys = self.ConfigKeys | self.AdapterSpecificConfigs
-
-        relevant_configs: Dict[str, Any] = {
-            key: new_configs[key] for key
-            in new_configs if key in config_keys
-        }
-
-        for key in self.AppendListFields:
-            append_fields = self.__get_as_list(relevant_configs, key)
-            mutable_config[key].extend([
-                f for f in append_fields if f not in mutable_config[key]
-            ])
-
-        for key in self.ExtendDictFields:
-            dict_val = relevant_configs.get(key, {})
-            try:
-                mutable_config[key].update(dict_val)
-            except (ValueError, TypeError, AttributeError):
-                dbt.exceptions.raise_compiler_error(
-                    'Invalid config field: "{}" must be a dict'.format(key)
-                )
-
-        for key in (self.ClobberFields | self.AdapterSpecificConfigs):
-            if key in relevant_configs:
-                mutable_config[key] = relevant_configs[key]
+                current = mutable_config.get(key)
+                if current is None:
+                    mutable_config[key] = dict(value)
+                else:
+                    current.update(value)
+            elif key in clobber_fields:
+                relevant_configs[key] = value
+                mutable_config[key] = value
 
         return relevant_configs
 
     def get_project_config(self, runtime_config):
+        # many nodes share a project, resource type, and fqn prefix, so the
+        # resolved project-level config is heavily repeated. The result is
+        # mutated downstream by _merge, so copy on cache hits.
+        cache = _per_project(_PROJECT_CONFIG_CACHE, runtime_config)
+        cache_key = (
+            self.active_project.credentials.type,
+            self.node_type,
+            tuple(self.fqn),
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return _copy_project_config(cached)
+
         # most configs are overwritten by a more specific config, but pre/post
-        # hooks are appended!
+        # hooks are appended! smart_update creates the append/extend
+        # containers lazily, so start empty rather than allocating a
+        # skeleton that is usually never filled.
         config: Dict[str, Any] = {}
-        for k in self.AppendListFields:
-            config[k] = []
-        for k in self.ExtendDictFields:
-            config[k] = {}
 
         if self.node_type == NodeType.Seed:
-            model_configs = runtime_config.seeds
+            config_attr = 'seeds'
         elif self.node_type == NodeType.Snapshot:
-            model_configs = runtime_config.snapshots
+            config_attr = 'snapshots'
         else:
-            model_configs = runtime_config.models
-
-        if model_configs is None:
-            return config
-
-        # mutates config
-        self.smart_update(config, model_configs)
-
-        fqn = self.fqn[:]
-        for level in fqn:
-            level_config = model_configs.get(level, None)
-            if level_config is None:
-                break
-
-            # mutates config
-            relevant_configs = self.smart_update(config, level_config)
-
-            clobber_configs = {
-                k: v for (k, v) in relevant_configs.items()
-                if k not in self.AppendListFields and
-                k not in self.ExtendDictFields
-            }
-
-            config.update(clobber_configs)
-            model_configs = model_configs[level]
+            config_attr = 'models'
+        model_configs = getattr(runtime_config, config_attr)
+
+        if model_configs is not None:
+            # nodes in the same package walk the same subtrees over and over;
+            # flatten the nested config tree into a prefix-keyed index once
+            # per project so each fqn level is a single dict lookup
+            indexes = _per_project(_PREFIX_INDEX_CACHE, runtime_config)
+            index = indexes.get(config_attr)
+            if index is None:
+                index = indexes[config_attr] = _build_prefix_index(
+                    model_configs
+                )
 
+            prefix: Tuple[str, ...] = ()
+            # the empty prefix is the root of the config tree
+            level_config = index[prefix]
+            while True:
+                # mutates config
+                self.smart_update(config, level_config)
+                if len(prefix) == len(self.fqn):
+                    break
+                prefix += (self.fqn[len(prefix)],)
+                level_config = index.get(prefix)
+                if level_config is None:
+                    break
+
+        cache[cache_key] = _copy_project_config(config)
         return config
 
     def load_config_from_own_project(self):
@@ -218,3 +295,134 @@ class SourceConfig:
 
     def load_config_from_active_project(self):
         return self.get_project_config(self.active_project)
+
+
+_TRANSLATION_CACHE: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+_PROJECT_CONFIG_CACHE: Dict[int, Dict[Any, Any]] = {}
+
+_PREFIX_INDEX_CACHE: Dict[int, Dict[Any, Any]] = {}
+
+
+def _per_project(store: Dict[int, Dict[Any, Any]],
+                 runtime_config) -> Dict[Any, Any]:
+    """Get the per-project sub-dict of a cache. RuntimeConfig is an unhashable
+    dataclass, so key on id() and evict the entry when the project is garbage
+    collected so a recycled id cannot serve stale data.
+    """
+    key = id(runtime_config)
+    cache = store.get(key)
+    if cache is None:
+        cache = store[key] = {}
+        weakref.finalize(runtime_config, store.pop, key, None)
+    return cache
+
+
+def _copy_project_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a resolved project config. Downstream merging only ever mutates
+    the top level of the append lists and extend dicts, so cloning those with
+    list()/dict() - which are single C-level copies, unlike copy.deepcopy -
+    is sufficient isolation between the cache and its consumers.
+    """
+    copied = {}
+    for key, value in config.items():
+        cls = value.__class__
+        if cls is list:
+            value = list(value)
+        elif cls is dict:
+            value = dict(value)
+        copied[key] = value
+    return copied
+
+
+def _build_prefix_index(
+    model_configs: Dict[str, Any]
+) -> Dict[Tuple[str, ...], Dict[str, Any]]:
+    """Flatten a nested model/seed/snapshot config tree into a map from fqn
+    prefix to subtree, with the tree root at the empty prefix.
+    """
+    index: Dict[Tuple[str, ...], Dict[str, Any]] = {(): model_configs}
+    stack = [((), model_configs)]
+    while stack:
+        prefix, subtree = stack.pop()
+        for key, value in subtree.items():
+            if isinstance(value, dict):
+                child = prefix + (key,)
+                index[child] = value
+                stack.append((child, value))
+    return index
+
+
+@lru_cache(maxsize=None)
+def _default_config(node_type: NodeType) -> Dict[str, Any]:
+    """Build the default config for a resource type. _merge never mutates its
+    inputs, so the cached dict can be shared across nodes.
+    """
+    defaults = {'enabled': True, 'materialized': 'view'}
+
+    if node_type == NodeType.Seed:
+        defaults['materialized'] = 'seed'
+    elif node_type == NodeType.Snapshot:
+        defaults['materialized'] = 'snapshot'
+
+    if node_type == NodeType.Test:
+        defaults['severity'] = 'ERROR'
+
+    return defaults
+
+
+def _update_append_field(in_model_config, key, value):
+    current = in_model_config.get(key, [])
+    cls = value.__class__
+    if cls is not list and cls is not tuple and \
+            not isinstance(value, (list, tuple)):
+        value = [value]
+    current.extend(value)
+    in_model_config[key] = current
+
+
+def _update_extend_field(in_model_config, key, value):
+    if value.__class__ is not dict and not isinstance(value, Mapping):
+        dbt.exceptions.raise_compiler_error(
+            'Invalid config field: "{}" must be a dict'.format(key)
+        )
+    current = in_model_config.get(key, {})
+    current.update(value)
+    in_model_config[key] = current
+
+
+FieldSets = Tuple[
+    FrozenSet[str], FrozenSet[str], FrozenSet[str], Dict[str, Callable]
+]
+
+_FIELD_SET_CACHE: Dict[str, FieldSets] = {}
+
+
+def _get_field_sets(adapter_type: str) -> FieldSets:
+    """Resolve the (AdapterSpecificConfigs, ClobberFields, ConfigKeys,
+    in-model handlers) tuple for an adapter type. A SourceConfig is created
+    for every node, but these only depend on the adapter, so compute them
+    once per adapter type.
+    """
+    field_sets = _FIELD_SET_CACHE.get(adapter_type)
+    if field_sets is None:
+        adapter_class = get_adapter_class_by_name(adapter_type)
+        adapter_specific = frozenset(adapter_class.AdapterSpecificConfigs)
+        # these are fixed once the adapter is known, so precompute the unions
+        # instead of rebuilding them on every key scan
+        clobber = frozenset(SourceConfig.ClobberFields | adapter_specific)
+        config_keys = frozenset(
+            SourceConfig.AppendListFields |
+            SourceConfig.ExtendDictFields |
+            clobber
+        )
+        # precomputed per-key dispatch for update_in_model_config; keys not
+        # in the table are simply overwritten
+        handlers: Dict[str, Callable] = {}
+        for key in SourceConfig.AppendListFields:
+            handlers[key] = _update_append_field
+        for key in SourceConfig.ExtendDictFields:
+            handlers[key] = _update_extend_field
+        field_sets = (adapter_specific, clobber, config_keys, handlers)
+        _FIELD_SET_CACHE[adapter_type] = field_sets
+    return field_sets
@@ -142,6 +142,31 @@ class SourceConfigTest(TestCase):
         }
         self.assertEqual(cfg.config, expect)
 
+    def test__source_config_fqn_levels(self):
+        self.root_project_config.models = {
+            'materialized': 'table',
+            'root': {
+                'materialized': 'ephemeral',
+                'x': {
+                    'enabled': False,
+                },
+            },
+        }
+        cfg = SourceConfig(self.root_project_config, self.root_project_config,
+                           ['root', 'x'], NodeType.Model)
+        expect = {
+            'column_types': {},
+            'enabled': False,
+            'materialized': 'ephemeral',
+            'persist_docs': {},
+            'post-hook': [],
+            'pre-hook': [],
+            'quoting': {},
+            'tags': [],
+            'vars': {},
+        }
+        self.assertEqual(cfg.config, expect)
+
     def test_source_config_all_keys_accounted_for(self):
         used_keys = frozenset(SourceConfig.AppendListFields) | \
                     frozenset(SourceConfig.ExtendDictFields) | \